@@ -0,0 +1,286 @@
+"""
+Database MCP Server Startup Benchmark
+Measures cold start: import time and time-to-first-response
+
+Claude Desktop spawns the server fresh for every session, so startup
+cost is paid every time. This script tracks it so regressions show up.
+
+Usage:
+    python bench_startup.py                       # print results
+    python bench_startup.py --save startup_baseline.json
+    python bench_startup.py --baseline startup_baseline.json
+
+With --baseline, the script exits with status 1 when any metric is
+slower than the saved run by more than --tolerance percent.
+
+Author: Rithwik Nyalam
+"""
+
+import argparse
+import json
+import queue
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+SERVER_SCRIPT = Path(__file__).resolve().parent / "database_mcp_server.py"
+
+# Seconds to wait for a server response before giving up
+RESPONSE_TIMEOUT = 30
+
+METRICS = ("import_ms", "initialize_ms", "list_tools_ms", "first_call_ms")
+
+
+def print_header(title: str):
+    """Print formatted section header"""
+    print("\n" + "=" * 70)
+    print(f"  {title}")
+    print("=" * 70)
+
+
+def measure_import_time(top: int = 10) -> dict:
+    """
+    Run the server script under `python -X importtime` with stdin closed.
+
+    The server starts up as usual, sees end of input and exits, so every
+    import it makes on the way, including those inside main() and the
+    background schema setup, is counted. It runs in a temporary directory
+    so the real data.db is never touched.
+
+    Args:
+        top: Number of slowest top-level imports to report
+
+    Returns:
+        dict: Total import time in ms and the slowest top-level imports
+    """
+    with tempfile.TemporaryDirectory() as workdir:
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", str(SERVER_SCRIPT)],
+            cwd=workdir,
+            stdin=subprocess.DEVNULL,
+            capture_output=True,
+            text=True,
+            timeout=RESPONSE_TIMEOUT
+        )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Server failed to start:\n{proc.stderr}")
+
+    # Lines look like: "import time:   self [us] | cumulative | imported package"
+    total_us = 0
+    top_level = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, package = line[len("import time:"):].split("|")
+        # Nested imports are indented; only count top-level ones
+        if package.startswith("  "):
+            continue
+        cumulative_us = int(cumulative)
+        total_us += cumulative_us
+        top_level.append((package.strip(), cumulative_us / 1000))
+
+    top_level.sort(key=lambda item: item[1], reverse=True)
+    return {
+        "import_ms": total_us / 1000,
+        "slowest_imports": top_level[:top]
+    }
+
+
+def send(proc: subprocess.Popen, message: dict):
+    """Write one JSON-RPC message to the server's stdin"""
+    proc.stdin.write(json.dumps(message) + "\n")
+    proc.stdin.flush()
+
+
+def start_reader(proc: subprocess.Popen) -> queue.Queue:
+    """
+    Forward the server's stdout lines to a queue from a background thread.
+
+    Reading through a queue lets read_response() give up after a deadline
+    instead of blocking forever in readline(). None marks end of output.
+    """
+    lines = queue.Queue()
+
+    def pump():
+        for line in proc.stdout:
+            lines.put(line)
+        lines.put(None)
+
+    threading.Thread(target=pump, daemon=True).start()
+    return lines
+
+
+def read_response(lines: queue.Queue, request_id: int) -> dict:
+    """Read server output until the response to request_id arrives"""
+    deadline = time.perf_counter() + RESPONSE_TIMEOUT
+    while True:
+        remaining = deadline - time.perf_counter()
+        try:
+            line = lines.get(timeout=max(remaining, 0))
+        except queue.Empty:
+            raise RuntimeError(
+                f"No response to request {request_id} within {RESPONSE_TIMEOUT}s"
+            ) from None
+        if line is None:
+            raise RuntimeError("Server exited before responding")
+        message = json.loads(line)
+        if message.get("id") == request_id:
+            return message
+
+
+def measure_first_response() -> dict:
+    """
+    Spawn the server and time the initialize, tools/list and first
+    tools/call round trips.
+
+    The first tool call (list_tags) is the first one that needs the
+    database, so it includes schema setup. The server runs in a temporary
+    directory so the benchmark never touches the real data.db.
+
+    Returns:
+        dict: Milliseconds from spawn to each response
+    """
+    with tempfile.TemporaryDirectory() as workdir:
+        start = time.perf_counter()
+        proc = subprocess.Popen(
+            [sys.executable, str(SERVER_SCRIPT)],
+            cwd=workdir,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True
+        )
+        lines = start_reader(proc)
+        try:
+            send(proc, {
+                "jsonrpc": "2.0",
+                "id": 1,
+                "method": "initialize",
+                "params": {
+                    "protocolVersion": "2024-11-05",
+                    "capabilities": {},
+                    "clientInfo": {"name": "bench-startup", "version": "1.0"}
+                }
+            })
+            read_response(lines, 1)
+            initialize_ms = (time.perf_counter() - start) * 1000
+
+            send(proc, {"jsonrpc": "2.0", "method": "notifications/initialized"})
+            send(proc, {"jsonrpc": "2.0", "id": 2, "method": "tools/list"})
+            read_response(lines, 2)
+            list_tools_ms = (time.perf_counter() - start) * 1000
+
+            send(proc, {
+                "jsonrpc": "2.0",
+                "id": 3,
+                "method": "tools/call",
+                "params": {"name": "list_tags", "arguments": {}}
+            })
+            read_response(lines, 3)
+            first_call_ms = (time.perf_counter() - start) * 1000
+        finally:
+            proc.kill()
+            proc.wait()
+
+    return {
+        "initialize_ms": initialize_ms,
+        "list_tools_ms": list_tools_ms,
+        "first_call_ms": first_call_ms
+    }
+
+
+def run_benchmark(runs: int) -> dict:
+    """
+    Run every measurement `runs` times and keep the median.
+
+    Args:
+        runs: Number of cold starts to measure
+
+    Returns:
+        dict: Median value for each metric plus the slowest imports
+    """
+    samples = {key: [] for key in METRICS}
+    slowest_imports = []
+
+    for _ in range(runs):
+        imports = measure_import_time()
+        slowest_imports = imports["slowest_imports"]
+        samples["import_ms"].append(imports["import_ms"])
+
+        for key, value in measure_first_response().items():
+            samples[key].append(value)
+
+    results = {key: statistics.median(values) for key, values in samples.items()}
+    results["slowest_imports"] = slowest_imports
+    return results
+
+
+def compare_to_baseline(results: dict, baseline: dict, tolerance: float) -> bool:
+    """
+    Print each metric next to its baseline value.
+
+    Args:
+        results: Metrics from this run
+        baseline: Metrics from a saved run
+        tolerance: Allowed slowdown in percent
+
+    Returns:
+        bool: True if no metric regressed beyond the tolerance
+    """
+    ok = True
+    for key in METRICS:
+        if key not in baseline:
+            continue
+        change = (results[key] - baseline[key]) / baseline[key] * 100
+        regressed = change > tolerance
+        ok = ok and not regressed
+        status = "REGRESSION" if regressed else "ok"
+        print(f"  {key:<15} {results[key]:8.1f} ms  "
+              f"(baseline {baseline[key]:8.1f} ms, {change:+6.1f}%)  {status}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark MCP server cold start")
+    parser.add_argument("--runs", type=int, default=5,
+                        help="Number of cold starts to measure (default: 5)")
+    parser.add_argument("--save", type=Path,
+                        help="Write results to this JSON file")
+    parser.add_argument("--baseline", type=Path,
+                        help="Compare against results saved with --save")
+    parser.add_argument("--tolerance", type=float, default=20.0,
+                        help="Allowed slowdown vs baseline in percent (default: 20)")
+    args = parser.parse_args()
+
+    print_header("DATABASE MCP SERVER STARTUP BENCHMARK")
+    print(f"\nMeasuring {args.runs} cold start(s)...")
+    results = run_benchmark(args.runs)
+
+    print_header("RESULTS (median)")
+    print(f"\n  Total import time:       {results['import_ms']:8.1f} ms")
+    print(f"  Time to initialize:      {results['initialize_ms']:8.1f} ms")
+    print(f"  Time to tools/list:      {results['list_tools_ms']:8.1f} ms")
+    print(f"  Time to first tool call: {results['first_call_ms']:8.1f} ms")
+    print("\nSlowest top-level imports:")
+    for package, ms in results["slowest_imports"]:
+        print(f"  {ms:8.1f} ms  {package}")
+
+    if args.save:
+        args.save.write_text(json.dumps(results, indent=2))
+        print(f"\nSaved results to {args.save}")
+
+    if args.baseline:
+        print_header("COMPARISON TO BASELINE")
+        baseline = json.loads(args.baseline.read_text())
+        if not compare_to_baseline(results, baseline, args.tolerance):
+            print(f"\nStartup regressed by more than {args.tolerance}%")
+            sys.exit(1)
+        print("\nNo startup regressions.")
+
+
+if __name__ == "__main__":
+    main()
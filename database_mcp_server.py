@@ -10,19 +10,19 @@ Date: December 27, 2024
 Part of: 30-Day RAG Learning Journey - Week 2
 """
 
+from __future__ import annotations
+
 import asyncio
 import logging
-import aiosqlite
-from typing import Any, List
+from typing import TYPE_CHECKING, Any, List, Optional
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+if TYPE_CHECKING:
+    import aiosqlite
+
+# Logging is configured in main() so importing this module stays cheap
 logger = logging.getLogger("database-mcp")
 
 # Initialize MCP server
@@ -31,18 +31,43 @@ app = Server("database-mcp-server")
 # Database configuration
 DB_PATH = "data.db"
 
+# Schema setup runs once per process, in the background (see main())
+_db_init_task: Optional[asyncio.Task] = None
+
+
+def connect_db() -> aiosqlite.Connection:
+    """
+    Open a connection to the notes database.
+    
+    aiosqlite is imported here rather than at module level so that it
+    is loaded by the background schema setup, not on the startup path.
+    
+    Returns:
+        aiosqlite.Connection: Connection usable with `async with`
+    """
+    import aiosqlite
+    
+    return aiosqlite.connect(DB_PATH)
+
 
 async def init_database():
     """
-    Initialize SQLite database with a simple notes table.
+    Initialize SQLite database with the notes and tagging tables.
     
     This creates a table to store notes with:
     - id: Auto-incrementing primary key
     - title: Note title
     - content: Note content
     - created_at: Timestamp
+    
+    Tags are normalized into two extra tables:
+    - tags: one row per tag name, with a cached note_count
+    - note_tags: many-to-many link between notes and tags
+    
+    Triggers keep tags.note_count in sync with note_tags and remove
+    links when a note is deleted, so facet listings never need a scan.
     """
-    async with aiosqlite.connect(DB_PATH) as db:
+    async with connect_db() as db:
         await db.execute("""
             CREATE TABLE IF NOT EXISTS notes (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -51,10 +76,166 @@ async def init_database():
                 created_at DATETIME DEFAULT CURRENT_TIMESTAMP
             )
         """)
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS tags (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL UNIQUE,
+                note_count INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        # (tag_id, note_id) answers "notes with tag X"; the reverse index
+        # answers "tags of note Y" and the delete trigger below.
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS note_tags (
+                tag_id INTEGER NOT NULL REFERENCES tags(id),
+                note_id INTEGER NOT NULL REFERENCES notes(id),
+                PRIMARY KEY (tag_id, note_id)
+            ) WITHOUT ROWID
+        """)
+        await db.execute("""
+            CREATE INDEX IF NOT EXISTS idx_note_tags_note
+            ON note_tags (note_id, tag_id)
+        """)
+        await db.execute("""
+            CREATE INDEX IF NOT EXISTS idx_tags_note_count
+            ON tags (note_count DESC, name)
+        """)
+        await db.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_note_tags_insert
+            AFTER INSERT ON note_tags
+            BEGIN
+                UPDATE tags SET note_count = note_count + 1 WHERE id = NEW.tag_id;
+            END
+        """)
+        await db.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_note_tags_delete
+            AFTER DELETE ON note_tags
+            BEGIN
+                UPDATE tags SET note_count = note_count - 1 WHERE id = OLD.tag_id;
+            END
+        """)
+        await db.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_notes_delete
+            AFTER DELETE ON notes
+            BEGIN
+                DELETE FROM note_tags WHERE note_id = OLD.id;
+            END
+        """)
         await db.commit()
     logger.info("Database initialized successfully")
 
 
+def start_database_init() -> asyncio.Task:
+    """
+    Schedule init_database() as a background task without waiting for it.
+    
+    The task is shared by the whole process, so the schema is only checked
+    once. A failed or cancelled initialization is scheduled again.
+    
+    Returns:
+        asyncio.Task: The shared initialization task
+    """
+    global _db_init_task
+    
+    task = _db_init_task
+    if task is None or (task.done() and (task.cancelled() or task.exception())):
+        task = _db_init_task = asyncio.create_task(init_database())
+        task.add_done_callback(_log_init_failure)
+    return task
+
+
+def _log_init_failure(task: asyncio.Task):
+    """Log a failed background initialization (it is retried on next use)"""
+    if not task.cancelled() and task.exception():
+        logger.error(f"Database initialization failed: {task.exception()}")
+
+
+async def ensure_database():
+    """
+    Make sure init_database() has completed before touching the database.
+    
+    main() starts initialization in the background once the session is up,
+    so this normally returns at once. If a tool call arrives first, it
+    waits for the same task to finish.
+    """
+    # Shield so a cancelled tool call does not cancel the shared task
+    await asyncio.shield(start_database_init())
+
+
+def normalize_tags(tags: Any) -> List[str]:
+    """
+    Clean up a list of tag names supplied by the client.
+    
+    Tags are stripped and lowercased, blanks are dropped and duplicates
+    removed while keeping the original order.
+    
+    Args:
+        tags: List of tag names (or None)
+        
+    Returns:
+        List[str]: Normalized, unique tag names
+    """
+    if not tags:
+        return []
+    if isinstance(tags, str):
+        tags = [tags]
+    
+    result = []
+    for tag in tags:
+        name = str(tag).strip().lower()
+        if name and name not in result:
+            result.append(name)
+    return result
+
+
+async def set_note_tags(db: aiosqlite.Connection, note_id: int, tags: List[str]):
+    """
+    Replace the tags attached to a note.
+    
+    Missing tags are created on the fly. Cached tag counts are updated
+    by the note_tags triggers. The caller is responsible for committing.
+    
+    Args:
+        db: Open database connection
+        note_id: ID of the note to tag
+        tags: Normalized tag names (an empty list clears all tags)
+    """
+    await db.execute("DELETE FROM note_tags WHERE note_id = ?", (note_id,))
+    if not tags:
+        return
+    
+    await db.executemany(
+        "INSERT OR IGNORE INTO tags (name) VALUES (?)",
+        [(tag,) for tag in tags]
+    )
+    placeholders = ", ".join("?" for _ in tags)
+    await db.execute(
+        f"INSERT INTO note_tags (tag_id, note_id) "
+        f"SELECT id, ? FROM tags WHERE name IN ({placeholders})",
+        [note_id, *tags]
+    )
+
+
+async def get_note_tags(db: aiosqlite.Connection, note_id: int) -> List[str]:
+    """
+    Get the tag names attached to a note, sorted alphabetically.
+    
+    Args:
+        db: Open database connection
+        note_id: ID of the note
+        
+    Returns:
+        List[str]: Tag names
+    """
+    async with db.execute(
+        "SELECT t.name FROM note_tags nt JOIN tags t ON t.id = nt.tag_id "
+        "WHERE nt.note_id = ? ORDER BY t.name",
+        (note_id,)
+    ) as cursor:
+        rows = await cursor.fetchall()
+    return [row[0] for row in rows]
+
+
 @app.list_tools()
 async def list_tools() -> List[Tool]:
     """
@@ -66,6 +247,8 @@ async def list_tools() -> List[Tool]:
     3. Update notes (UPDATE)
     4. Delete notes (DELETE)
     5. Search notes (LIKE query)
+    6. Find notes by tags (indexed AND/OR lookup)
+    7. List tags with their note counts
     
     Returns:
         List[Tool]: Available database operations
@@ -84,6 +267,11 @@ async def list_tools() -> List[Tool]:
                     "content": {
                         "type": "string",
                         "description": "Content/body of the note"
+                    },
+                    "tags": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Tags to attach to the note (optional)"
                     }
                 },
                 "required": ["title", "content"]
@@ -129,6 +317,11 @@ async def list_tools() -> List[Tool]:
                     "content": {
                         "type": "string",
                         "description": "New content (optional)"
+                    },
+                    "tags": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Replacement set of tags (optional, empty list clears tags)"
                     }
                 },
                 "required": ["id"]
@@ -161,6 +354,35 @@ async def list_tools() -> List[Tool]:
                 },
                 "required": ["keyword"]
             }
+        ),
+        Tool(
+            name="find_notes_by_tags",
+            description="Find notes carrying all (AND) or any (OR) of the given tags",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "tags": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Tags to match"
+                    },
+                    "match": {
+                        "type": "string",
+                        "enum": ["all", "any"],
+                        "description": "'all' for AND semantics (default), 'any' for OR"
+                    }
+                },
+                "required": ["tags"]
+            }
+        ),
+        Tool(
+            name="list_tags",
+            description="List all tags with the number of notes using each",
+            inputSchema={
+                "type": "object",
+                "properties": {},
+                "required": []
+            }
         )
     ]
 
@@ -182,27 +404,32 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
     """
     
     try:
+        await ensure_database()
+        
         if name == "create_note":
             # INSERT operation
             title = arguments.get("title")
             content = arguments.get("content")
+            tags = normalize_tags(arguments.get("tags"))
             
-            async with aiosqlite.connect(DB_PATH) as db:
+            async with connect_db() as db:
                 cursor = await db.execute(
                     "INSERT INTO notes (title, content) VALUES (?, ?)",
                     (title, content)
                 )
-                await db.commit()
                 note_id = cursor.lastrowid
+                await set_note_tags(db, note_id, tags)
+                await db.commit()
             
-            return [TextContent(
-                type="text",
-                text=f"Note created successfully! ID: {note_id}\nTitle: {title}"
-            )]
+            result = f"Note created successfully! ID: {note_id}\nTitle: {title}"
+            if tags:
+                result += f"\nTags: {', '.join(tags)}"
+            
+            return [TextContent(type="text", text=result)]
         
         elif name == "get_all_notes":
             # SELECT ALL operation
-            async with aiosqlite.connect(DB_PATH) as db:
+            async with connect_db() as db:
                 async with db.execute("SELECT * FROM notes ORDER BY created_at DESC") as cursor:
                     rows = await cursor.fetchall()
             
@@ -227,12 +454,13 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
             # SELECT BY ID operation
             note_id = arguments.get("id")
             
-            async with aiosqlite.connect(DB_PATH) as db:
+            async with connect_db() as db:
                 async with db.execute(
                     "SELECT * FROM notes WHERE id = ?", 
                     (note_id,)
                 ) as cursor:
                     row = await cursor.fetchone()
+                tags = await get_note_tags(db, note_id) if row else []
             
             if not row:
                 return [TextContent(
@@ -245,6 +473,8 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
             result += f"Title: {row[1]}\n"
             result += f"Content: {row[2]}\n"
             result += f"Created: {row[3]}\n"
+            if tags:
+                result += f"Tags: {', '.join(tags)}\n"
             
             return [TextContent(type="text", text=result)]
         
@@ -253,6 +483,7 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
             note_id = arguments.get("id")
             title = arguments.get("title")
             content = arguments.get("content")
+            tags = arguments.get("tags")
             
             # Build dynamic UPDATE query
             updates = []
@@ -265,24 +496,36 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
                 updates.append("content = ?")
                 params.append(content)
             
-            if not updates:
+            if not updates and tags is None:
                 return [TextContent(
                     type="text",
-                    text="No fields to update. Provide title or content."
+                    text="No fields to update. Provide title, content or tags."
                 )]
             
             params.append(note_id)
-            query = f"UPDATE notes SET {', '.join(updates)} WHERE id = ?"
             
-            async with aiosqlite.connect(DB_PATH) as db:
-                cursor = await db.execute(query, params)
-                await db.commit()
+            async with connect_db() as db:
+                if updates:
+                    query = f"UPDATE notes SET {', '.join(updates)} WHERE id = ?"
+                    cursor = await db.execute(query, params)
+                    found = cursor.rowcount > 0
+                else:
+                    # Tags-only update: just check the note exists
+                    async with db.execute(
+                        "SELECT 1 FROM notes WHERE id = ?",
+                        (note_id,)
+                    ) as cursor:
+                        found = await cursor.fetchone() is not None
                 
-                if cursor.rowcount == 0:
+                if not found:
                     return [TextContent(
                         type="text",
                         text=f"Note with ID {note_id} not found."
                     )]
+                
+                if tags is not None:
+                    await set_note_tags(db, note_id, normalize_tags(tags))
+                await db.commit()
             
             return [TextContent(
                 type="text",
@@ -293,7 +536,7 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
             # DELETE operation
             note_id = arguments.get("id")
             
-            async with aiosqlite.connect(DB_PATH) as db:
+            async with connect_db() as db:
                 cursor = await db.execute(
                     "DELETE FROM notes WHERE id = ?",
                     (note_id,)
@@ -315,7 +558,7 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
             # SEARCH operation (LIKE query)
             keyword = arguments.get("keyword")
             
-            async with aiosqlite.connect(DB_PATH) as db:
+            async with connect_db() as db:
                 async with db.execute(
                     "SELECT * FROM notes WHERE title LIKE ? OR content LIKE ?",
                     (f"%{keyword}%", f"%{keyword}%")
@@ -338,6 +581,101 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
             
             return [TextContent(type="text", text=result)]
         
+        elif name == "find_notes_by_tags":
+            # TAG LOOKUP operation (indexed AND/OR)
+            tags = normalize_tags(arguments.get("tags"))
+            match = arguments.get("match") or "all"
+            
+            if not tags:
+                return [TextContent(
+                    type="text",
+                    text="Provide at least one tag to search for."
+                )]
+            if match not in ("all", "any"):
+                return [TextContent(
+                    type="text",
+                    text=f"Invalid match mode '{match}'. Use 'all' or 'any'."
+                )]
+            
+            placeholders = ", ".join("?" for _ in tags)
+            
+            async with connect_db() as db:
+                # Cached cardinalities come straight from the tags table
+                async with db.execute(
+                    f"SELECT name, note_count FROM tags WHERE name IN ({placeholders})",
+                    tags
+                ) as cursor:
+                    counts = dict(await cursor.fetchall())
+                
+                # AND can be answered without touching note_tags when any
+                # tag is unused; OR only needs the tags that exist.
+                if match == "all" and any(not counts.get(tag) for tag in tags):
+                    rows = []
+                elif not any(counts.values()):
+                    rows = []
+                else:
+                    required = len(tags) if match == "all" else 1
+                    async with db.execute(
+                        f"""
+                        SELECT n.id, n.title, n.content, n.created_at, m.hits
+                        FROM (
+                            SELECT nt.note_id, COUNT(*) AS hits
+                            FROM tags t
+                            JOIN note_tags nt ON nt.tag_id = t.id
+                            WHERE t.name IN ({placeholders})
+                            GROUP BY nt.note_id
+                            HAVING COUNT(*) >= ?
+                        ) m
+                        JOIN notes n ON n.id = m.note_id
+                        ORDER BY m.hits DESC, n.created_at DESC
+                        """,
+                        [*tags, required]
+                    ) as cursor:
+                        rows = await cursor.fetchall()
+            
+            mode = "AND" if match == "all" else "OR"
+            tag_summary = ", ".join(f"{tag} ({counts.get(tag, 0)})" for tag in tags)
+            
+            if not rows:
+                return [TextContent(
+                    type="text",
+                    text=f"No notes found for tags [{mode}]: {tag_summary}"
+                )]
+            
+            result = f"Notes matching tags [{mode}]: {tag_summary}\n"
+            result += f"Found {len(rows)} note(s)\n\n"
+            for row in rows:
+                result += f"ID: {row[0]}\n"
+                result += f"Title: {row[1]}\n"
+                result += f"Content: {row[2][:100]}...\n"  # Preview
+                result += f"Created: {row[3]}\n"
+                if match == "any":
+                    result += f"Matched tags: {row[4]}/{len(tags)}\n"
+                result += "-" * 50 + "\n"
+            
+            return [TextContent(type="text", text=result)]
+        
+        elif name == "list_tags":
+            # FACET LISTING operation (cached counts)
+            async with connect_db() as db:
+                async with db.execute(
+                    "SELECT name, note_count FROM tags "
+                    "WHERE note_count > 0 ORDER BY note_count DESC, name"
+                ) as cursor:
+                    rows = await cursor.fetchall()
+            
+            if not rows:
+                return [TextContent(
+                    type="text",
+                    text="No tags found in database."
+                )]
+            
+            result = "Tags:\n\n"
+            for row in rows:
+                result += f"{row[0]}: {row[1]} note(s)\n"
+            
+            return [TextContent(type="text", text=result)]
+        
         else:
             return [TextContent(
                 type="text",
@@ -356,17 +694,24 @@ async def main():
     """
     Main entry point for the database MCP server.
     
-    Initializes database and starts MCP server on stdio.
+    Starts the MCP server on stdio straight away. Database setup is
+    scheduled in the background instead of awaited, so initialize and
+    list_tools are answered without waiting on SQLite. Tool calls wait
+    for it through ensure_database().
     """
-    logger.info("Starting Database MCP Server...")
-    
-    # Initialize database
-    await init_database()
+    # Configure logging
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
     
-    logger.info("Available operations: create, read, update, delete, search")
+    logger.info("Starting Database MCP Server...")
+    logger.info("Available operations: create, read, update, delete, search, tags")
     logger.info("Listening on stdio for MCP connections...")
     
     async with stdio_server() as (read_stream, write_stream):
+        start_database_init()
+        
         await app.run(
             read_stream,
             write_stream,
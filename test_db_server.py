@@ -29,6 +29,7 @@ async def test_database_mcp():
     4. Update note (UPDATE)
     5. Search notes (LIKE)
     6. Delete note (DELETE)
+    7. Tag notes and query by tags (AND/OR)
     """
     
     print_header("DATABASE MCP SERVER TEST")
@@ -125,6 +126,40 @@ async def test_database_mcp():
                 result = await session.call_tool("get_all_notes", {})
                 print(result.content[0].text)
                 
+                # Test 7: Tags
+                print("\nTest 7: Tagging Notes")
+                print("-" * 70)
+                result = await session.call_tool("create_note", {
+                    "title": "Async SQLite Tips",
+                    "content": "Use parameterized queries and commit after writes.",
+                    "tags": ["sqlite", "mcp", "tips"]
+                })
+                print(result.content[0].text)
+                
+                result = await session.call_tool("update_note", {
+                    "id": 1,
+                    "tags": ["mcp", "learning"]
+                })
+                print(result.content[0].text)
+                
+                print("\nNotes tagged 'mcp' AND 'sqlite':")
+                result = await session.call_tool("find_notes_by_tags", {
+                    "tags": ["mcp", "sqlite"],
+                    "match": "all"
+                })
+                print(result.content[0].text)
+                
+                print("\nNotes tagged 'learning' OR 'tips':")
+                result = await session.call_tool("find_notes_by_tags", {
+                    "tags": ["learning", "tips"],
+                    "match": "any"
+                })
+                print(result.content[0].text)
+                
+                print("\nTag counts:")
+                result = await session.call_tool("list_tags", {})
+                print(result.content[0].text)
+                
                 # Summary
                 print_header("TEST SUMMARY")
                 print("\nAll database operations tested successfully!")
@@ -134,6 +169,7 @@ async def test_database_mcp():
                 print("  [X] UPDATE - Modify existing notes")
                 print("  [X] DELETE - Remove notes")
                 print("  [X] SEARCH - Find notes by keyword")
+                print("  [X] TAGS - Tag notes and find them by tags")
                 print("\n" + "=" * 70)
                 print("Day 9 Complete! Database MCP Server working perfectly.")
                 print("=" * 70 + "\n")